@@ -1,12 +1,12 @@
 #!/usr/bin/env python
 import os
 import re
+import sys
 import argparse
 import csv
 from io import BytesIO
 from email.parser import BytesHeaderParser
-from twisted.internet import reactor, protocol, defer
-from twisted.application import service, internet
+from twisted.internet import protocol, defer
 from twisted.mail import imap4
 from twisted.cred import portal, credentials
 from zope.interface import implementer
@@ -16,38 +16,63 @@ from twisted.mail.imap4 import MessageSet
 
 CREDENTIALS_CSV = "/home/ec2-user/tarearedes/TareaRedes/ProyectoRedes/src/IMAPServer/credentials.csv"
 
-# Inicializa el checker cargando las credenciales desde el CSV, filtrando filas inválidas.
+# Normaliza una dirección de correo pasando el dominio a minúsculas, igual que el servidor SMTP al almacenar.
+def normalize_email(address):
+    local_part, sep, domain = address.rpartition('@')
+    if not sep:
+        return address
+    return local_part + '@' + domain.lower()
+
+# Carga las credenciales desde el CSV en un diccionario nuevo, filtrando filas inválidas.
+def load_credentials(csvPath):
+    creds = {}
+    try:
+        with open(csvPath, newline='', encoding="utf-8") as csvfile:
+            reader = csv.reader(csvfile)
+            for row in reader:
+                if len(row) < 2:
+                    continue
+                if "@" not in row[0]:
+                    continue
+                user = normalize_email(row[0].strip())
+                pwd = row[1].strip()
+                creds[user] = pwd
+    except Exception as e:
+        print("Error al cargar credenciales desde CSV:", e)
+        raise e
+    return creds
+
+# Inicializa el checker cargando las credenciales desde el CSV.
 @implementer(ICredentialsChecker)
 class CSVCredentialsChecker:
     credentialInterfaces = (credentials.IUsernamePassword,)
 
     def __init__(self, csvPath):
-        self.creds = {}
+        self.csvPath = csvPath
+        self.creds = load_credentials(csvPath)
+
+    # Lee el CSV indicado e intercambia el diccionario completo de una vez; si la lectura falla
+    # (load_credentials ya imprime el motivo), retorna False y se conservan las credenciales anteriores.
+    def reload(self, csvPath):
         try:
-            with open(csvPath, newline='', encoding="utf-8") as csvfile:
-                reader = csv.reader(csvfile)
-                for row in reader:
-                    if len(row) < 2:
-                        continue
-                    if "@" not in row[0]:
-                        continue
-                    user = row[0].strip()
-                    pwd = row[1].strip()
-                    self.creds[user] = pwd
-        except Exception as e:
-            print("Error al cargar credenciales desde CSV:", e)
-            raise e
+            creds = load_credentials(csvPath)
+        except Exception:
+            return False
+        self.csvPath = csvPath
+        self.creds = creds
+        return True
 
     # Valida el login comparando usuario y contraseña, retornando un Deferred según el resultado.
     def requestAvatarId(self, credentials):
-        username = (credentials.username.decode('utf-8')
-                    if isinstance(credentials.username, bytes)
-                    else credentials.username).strip().strip('"')
+        username = normalize_email((credentials.username.decode('utf-8')
+                                    if isinstance(credentials.username, bytes)
+                                    else credentials.username).strip().strip('"'))
         password = (credentials.password.decode('utf-8')
                     if isinstance(credentials.password, bytes)
                     else credentials.password).strip().strip('"')
         print("Intento de login - Usuario:", username, "Contraseña:", password)
-        if username in self.creds and self.creds[username] == password:
+        creds = self.creds
+        if username in creds and creds[username] == password:
             return defer.succeed(username)
         else:
             return defer.fail(error.UnauthorizedLogin("Invalid login"))
@@ -212,7 +237,7 @@ class IMAPAccount:
         if len(parts) != 2:
             raise Exception("Formato de email inválido")
         local_part, domain = parts
-        self.mailboxPath = os.path.join(base_storage, domain, local_part)
+        self.mailboxPath = os.path.join(base_storage, domain.lower(), local_part)
         os.makedirs(self.mailboxPath, exist_ok=True)
 
     # Retorna una lista de buzones disponibles, en este caso solo se retorna 'INBOX'.
@@ -283,15 +308,63 @@ def parse_args():
                         help="Ruta base de almacenamiento de correos (estructura: base/dominio/usuario)")
     parser.add_argument("-p", "--port", type=int, required=True,
                         help="Puerto en el que se ejecutará el servidor IMAP")
+    parser.add_argument("-c", "--config",
+                        help="Archivo de configuración (sección [imap], clave 'credentials'); se recarga con SIGHUP")
     return parser.parse_args()
 
+# Retorna la ruta del CSV de credenciales definida en la sección [imap] del archivo de configuración;
+# las rutas relativas se resuelven respecto al directorio del propio archivo de configuración.
+def load_credentials_path(config_path):
+    import configparser
+
+    config = configparser.ConfigParser()
+    if not config.read(config_path, encoding="utf-8"):
+        raise IOError("No se pudo leer el archivo de configuración: " + config_path)
+    csvPath = config.get("imap", "credentials").strip()
+    if not csvPath:
+        raise ValueError("La clave 'credentials' de la sección [imap] está vacía")
+    return os.path.join(os.path.dirname(os.path.abspath(config_path)), csvPath)
+
+# Recarga la configuración y las credenciales del checker; si algo falla, se mantiene lo anterior.
+def reload_config(checker, config_path):
+    try:
+        csvPath = load_credentials_path(config_path)
+    except Exception as e:
+        print("Error al recargar la configuración, se mantiene la anterior:", e)
+        return
+    if not checker.reload(csvPath):
+        print("Error al recargar las credenciales desde", csvPath + ", se mantienen las anteriores")
+        return
+    print("Configuración recargada,", len(checker.creds), "usuarios desde", csvPath)
+
+# Instala un manejador de SIGHUP que programa la recarga dentro del reactor, sin cortar sesiones activas.
+def install_reload_handler(checker, config_path):
+    import signal
+    from twisted.internet import reactor
+
+    if not hasattr(signal, "SIGHUP"):
+        return
+
+    def handler(signum, frame):
+        reactor.callFromThread(reload_config, checker, config_path)
+
+    signal.signal(signal.SIGHUP, handler)
+
 # Configura y arranca el servidor IMAP creando el realm, checker, portal y fábrica, e inicia el reactor en el puerto especificado.
 def main():
+    from twisted.internet import reactor
+
     args = parse_args()
     realm = IMAPRealm(args.storage)
-    checker = CSVCredentialsChecker(CREDENTIALS_CSV)
+    try:
+        csvPath = load_credentials_path(args.config) if args.config else CREDENTIALS_CSV
+        checker = CSVCredentialsChecker(csvPath)
+    except Exception as e:
+        sys.exit("Error en la configuración: {}".format(e))
     imap_portal = portal.Portal(realm, [checker])
     imapFactory = IMAP4ServerFactory(imap_portal)
+    if args.config:
+        install_reload_handler(checker, args.config)
     print("Servidor IMAP iniciado en el puerto", args.port)
     reactor.listenTCP(args.port, imapFactory)
     reactor.run()
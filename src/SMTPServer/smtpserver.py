@@ -10,7 +10,6 @@ from twisted.cred.portal import Portal
 import argparse
 from twisted.python import log
 import sys
-log.startLogging(sys.stdout)
 
 
 @implementer(smtp.IMessageDelivery)
@@ -18,9 +17,14 @@ class ConsoleMessageDelivery:
 
     # Inicializa la instancia con la lista de dominios permitidos y la ruta donde se almacenarán los correos.
     def __init__(self, domains, storage_path):
-        self.domains = domains  # Lista de dominios permitidos
+        self.setDomains(domains)
         self.storage_path = storage_path
 
+    # Reemplaza la tabla de dominios permitidos por un frozenset nuevo. La asignación es atómica,
+    # así que las sesiones abiertas siguen funcionando y ven la tabla nueva en su próximo RCPT TO.
+    def setDomains(self, domains):
+        self.domains = frozenset(d.lower() for d in domains)
+
     # Devuelve un encabezado 'Received' personalizado para el correo entrante.
     def receivedHeader(self, helo, origin, recipients):
         return "Received: server sigifedo.lat"
@@ -38,10 +42,13 @@ class ConsoleMessageDelivery:
 
         if isinstance(recipient_domain, bytes):
             recipient_domain = recipient_domain.decode('utf-8', errors='replace')
+        if recipient_domain is not None:
+            # Se normaliza una sola vez para que la búsqueda y la ruta de almacenamiento coincidan con IMAP.
+            recipient_domain = recipient_domain.lower()
         if isinstance(local_part, bytes):
             local_part = local_part.decode('utf-8', errors='replace')
         #print("DEBUG: user.dest.domain =", repr(recipient_domain))
-        if recipient_domain not in self.domains:
+        if recipient_domain is None or recipient_domain not in self.domains:
             raise smtp.SMTPBadRcpt(user)
         return lambda: ConsoleMessage(self.storage_path, recipient_domain, local_part)
 
@@ -127,14 +134,57 @@ class SimpleRealm:
 # Analiza y retorna los argumentos de línea de comando para configurar el servidor SMTP.
 def parse_args():
     parser = argparse.ArgumentParser(description="Servidor SMTP con Twisted")
-    parser.add_argument("-d", "--domains", required=True,
-                        help="Lista de dominios aceptados (separados por comas)")
+    domains_group = parser.add_mutually_exclusive_group(required=True)
+    domains_group.add_argument("-d", "--domains",
+                               help="Lista de dominios aceptados (separados por comas)")
+    domains_group.add_argument("-c", "--config",
+                               help="Archivo de configuración (sección [smtp], clave 'domains'); se recarga con SIGHUP")
     parser.add_argument("-s", "--storage", required=True,
                         help="Ruta de almacenamiento de correos")
     parser.add_argument("-p", "--port", type=int, required=True,
                         help="Puerto en el que se ejecutará el servidor SMTP")
     return parser.parse_args()
 
+# Procesa una lista de dominios separados por comas (ejemplo: "example.com,otro.com"),
+# descartando entradas vacías; lanza ValueError si no queda ningún dominio.
+def parse_domains(value):
+    domains = [d.strip() for d in value.split(",") if d.strip()]
+    if not domains:
+        raise ValueError("La lista de dominios aceptados está vacía")
+    return domains
+
+# Lee los dominios aceptados desde la sección [smtp] del archivo de configuración.
+def load_domains(config_path):
+    import configparser
+
+    config = configparser.ConfigParser()
+    if not config.read(config_path, encoding="utf-8"):
+        raise IOError("No se pudo leer el archivo de configuración: " + config_path)
+    return parse_domains(config.get("smtp", "domains"))
+
+# Recarga el archivo de configuración e intercambia la tabla de dominios; si falla, conserva la anterior.
+def reload_config(delivery, config_path):
+    try:
+        domains = load_domains(config_path)
+    except Exception as e:
+        log.msg("Error al recargar la configuración, se mantiene la anterior: {}".format(e))
+        return
+    delivery.setDomains(domains)
+    log.msg("Configuración recargada, dominios aceptados: {}".format(", ".join(sorted(delivery.domains))))
+
+# Instala un manejador de SIGHUP que programa la recarga dentro del reactor, sin cortar sesiones activas.
+def install_reload_handler(delivery, config_path):
+    import signal
+    from twisted.internet import reactor
+
+    if not hasattr(signal, "SIGHUP"):
+        return
+
+    def handler(signum, frame):
+        reactor.callFromThread(reload_config, delivery, config_path)
+
+    signal.signal(signal.SIGHUP, handler)
+
 # Configura y arranca el servidor SMTP: procesa argumentos, inicializa componentes y crea el servicio en el puerto especificado.
 def main():
     from twisted.application import internet
@@ -142,8 +192,13 @@ def main():
 
     args = parse_args()
 
-    # Procesa la lista de dominios (ejemplo: "example.com,otro.com")
-    domains_list = [d.strip() for d in args.domains.split(",")]
+    try:
+        if args.config:
+            domains_list = load_domains(args.config)
+        else:
+            domains_list = parse_domains(args.domains)
+    except Exception as e:
+        sys.exit("Error en la configuración: {}".format(e))
 
     delivery = ConsoleMessageDelivery(domains_list, args.storage)
 
@@ -154,15 +209,19 @@ def main():
     smtpFactory = ConsoleSMTPFactory(portal, delivery)
     internet.TCPServer(args.port, smtpFactory).setServiceParent(a)
 
-    return a
+    if args.config:
+        install_reload_handler(delivery, args.config)
 
+    return a
 
-application = main()
 
 if __name__ == '__main__':
     from twisted.application import service
     from twisted.internet import reactor
 
+    log.startLogging(sys.stdout)
+    application = main()
+
     # 1. Arranca el servicio
     service.IService(application).startService()
 